@@ -18,14 +18,26 @@ Primary Pipeline (automated):
   Audio uploaded to S3 → S3Watcher detects → Transcribe → Fetch patient info
   from Scriberyte → LLM parse → Generate HTML chart → Upload to S3
 """
-from fastapi import FastAPI, HTTPException
-from src.models import TranscriptProcessRequest, AddendumRequest, PatientInformation, S3ProcessRequest
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from typing import List, Optional
+from src.models import TranscriptProcessRequest, AddendumRequest, PatientInformation, S3ProcessRequest, EncounterState
 from src.manager import EncounterManager
 import uvicorn
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-app = FastAPI(title="WoundCare AI Pipeline API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Let background chart uploads finish before the worker exits
+    await manager.wait_for_uploads()
+    manager.close()
+
+
+app = FastAPI(title="WoundCare AI Pipeline API", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -36,6 +48,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (the /appointments listing carries full encounter state)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 manager = EncounterManager()
 
 # ─────────────────────────────────────────────
@@ -51,15 +66,22 @@ async def health_check():
 # ─────────────────────────────────────────────
 # Appointments
 # ─────────────────────────────────────────────
+# These handlers only do blocking disk / S3 / index work, so they are plain
+# `def` and run in Starlette's threadpool instead of on the event loop.
 
 @app.get("/appointments")
-async def get_appointments():
-    """List all appointments."""
-    return manager.list_appointments()
+def get_appointments(request: Request, response: Response, limit: Optional[int] = Query(None, ge=1)) -> List[EncounterState]:
+    """List appointments newest first, optionally only the first `limit` (supports conditional GET via ETag / If-None-Match)."""
+    manager.sync_appointments_from_s3()
+    etag = manager.appointments_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return manager.list_appointments(sync_s3=False, limit=limit)
 
 
 @app.post("/appointments/book")
-async def book_appointment(req: PatientInformation):
+def book_appointment(req: PatientInformation):
     """Create a new appointment (called by Scriberyte or manually)."""
     try:
         appointment = manager.create_appointment(req)
@@ -72,7 +94,7 @@ async def book_appointment(req: PatientInformation):
 
 
 @app.delete("/appointments/{appointment_id}")
-async def delete_appointment(appointment_id: str):
+def delete_appointment(appointment_id: str):
     """Delete an appointment."""
     try:
         manager.delete_appointment(appointment_id)
@@ -168,4 +190,12 @@ async def addendum(req: AddendumRequest):
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Import string (not the app object) is required for multi-worker mode
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", min(8, os.cpu_count() or 1))),
+    )
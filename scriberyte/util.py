@@ -2,6 +2,37 @@ import re
 import json
 import copy
 
+# Wound Assessment Table rows: (label, wound field)
+WOUND_TABLE_ATTRS = (
+    ("MIST Therapy", "mist_therapy"),
+    ("Wound Location", "location"),
+    ("Outcome", "outcome"),
+    ("Wound Type", "type"),
+    ("Wound Status", "status"),
+    ("Measurements (L x W x D)", "measurements"),
+    ("Area (sq cm)", "area_sq_cm"),
+    ("Volume (cm³)", "volume_cu_cm"),
+    ("Tunnels", "tunnels"),
+    ("Max Depth (cm)", "max_depth"),
+    ("Undermining (cm)", "undermining"),
+    ("Stage / Grade", "stage_grade"),
+    ("Exudate Amount", "exudate_amount"),
+    ("Exudate Type", "exudate_type"),
+    ("Odor", "odor"),
+    ("Wound Margin", "wound_margin"),
+    ("Periwound", "periwound"),
+    ("Necrotic Material (%)", "necrotic_material"),
+    ("Granulation (%)", "granulation"),
+    ("Tissue Exposed", "tissue_exposed"),
+    ("Debridement", "debridement"),
+    ("Primary Dressing", "primary_dressing"),
+    ("Secondary Dressing", "secondary_dressing"),
+    ("Frequency", "frequency"),
+    ("Special Equipment", "special_equipment"),
+)
+WOUND_TABLE_LABELS = tuple(label for label, _ in WOUND_TABLE_ATTRS)
+WOUND_TABLE_KEYS = tuple(key for _, key in WOUND_TABLE_ATTRS)
+
 def json_to_html_with_sections_for_wound_care(json_data, schema_name=None):
     """
     Convert ChatGPT JSON output to:
@@ -73,38 +104,18 @@ def json_to_html_with_sections_for_wound_care(json_data, schema_name=None):
                 if row: html += f"  <tr><th>{row[0]}</th>" + "".join(f"<td>{v}</td>" for v in row[1:]) + "</tr>\n"
             html += "</tbody></table>\n"
         elif wounds_data:
-            ATTRS = [
-                ("MIST Therapy", "mist_therapy"),
-                ("Wound Location", "location"),
-                ("Outcome", "outcome"),
-                ("Wound Type", "type"),
-                ("Wound Status", "status"),
-                ("Measurements (L x W x D)", "measurements"),
-                ("Area (sq cm)", "area_sq_cm"),
-                ("Volume (cm³)", "volume_cu_cm"),
-                ("Tunnels", "tunnels"),
-                ("Max Depth (cm)", "max_depth"),
-                ("Undermining (cm)", "undermining"),
-                ("Stage / Grade", "stage_grade"),
-                ("Exudate Amount", "exudate_amount"),
-                ("Exudate Type", "exudate_type"),
-                ("Odor", "odor"),
-                ("Wound Margin", "wound_margin"),
-                ("Periwound", "periwound"),
-                ("Necrotic Material (%)", "necrotic_material"),
-                ("Granulation (%)", "granulation"),
-                ("Tissue Exposed", "tissue_exposed"),
-                ("Debridement", "debridement"),
-                ("Primary Dressing", "primary_dressing"),
-                ("Secondary Dressing", "secondary_dressing"),
-                ("Frequency", "frequency"),
-                ("Special Equipment", "special_equipment")
-            ]
             wound_headers = [f"<th>Wound {w.get('number', i+1)}</th>" for i, w in enumerate(wounds_data)]
             html += "<h2 class='wc-h2'>Wound Assessment Table</h2>\n<table class='wound-table'>\n"
             html += "  <thead><tr><th>Field</th>" + "".join(wound_headers) + "</tr></thead>\n<tbody>\n"
-            for label, key in ATTRS:
-                html += f"  <tr><th>{label}</th>" + "".join(f"<td>{w.get(key, '-')}</td>" for w in wounds_data) + "</tr>\n"
+            # Format cells one wound at a time, then transpose into one row per attribute
+            wound_cells = [
+                [f"<td>{w.get(key, '-')}</td>" for key in WOUND_TABLE_KEYS]
+                for w in wounds_data
+            ]
+            html += "".join(
+                f"  <tr><th>{label}</th>" + "".join(row_cells) + "</tr>\n"
+                for label, row_cells in zip(WOUND_TABLE_LABELS, zip(*wound_cells))
+            )
             html += "</tbody></table>\n"
 
         # 3. Detailed Summaries
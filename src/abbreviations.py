@@ -2,6 +2,7 @@
 WoundCare AI - Abbreviation Memory Store
 Centralized repository of clinical abbreviations for decoding handwritten notes and dictations.
 """
+from functools import lru_cache
 
 ABBREVIATION_STORE = {
     "Wound Types": {
@@ -185,13 +186,21 @@ ABBREVIATION_STORE = {
     }
 }
 
+@lru_cache(maxsize=None)
 def get_abbreviation_markdown() -> str:
-    """Returns the store formatted as a markdown table for the prompt."""
-    md = ""
+    """Returns the store formatted as a markdown table for the prompt (built once).
+
+    Abbreviations sharing a meaning within a category are listed on one row
+    to keep the prompt short.
+    """
+    parts = []
     for category, items in ABBREVIATION_STORE.items():
-        md += f"### {category}\n"
-        md += "| Abbrev | Meaning |\n|---|---|\n"
+        by_meaning = {}
         for abbrev, meaning in items.items():
-            md += f"| {abbrev} | {meaning} |\n"
-        md += "\n"
-    return md
+            by_meaning.setdefault(meaning, []).append(abbrev)
+        parts.append(f"### {category}\n")
+        parts.append("| Abbrev | Meaning |\n|---|---|\n")
+        for meaning, abbrevs in by_meaning.items():
+            parts.append(f"| {', '.join(abbrevs)} | {meaning} |\n")
+        parts.append("\n")
+    return "".join(parts)
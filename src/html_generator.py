@@ -13,16 +13,18 @@ Output sections:
   6. Footer
 """
 from .models import EncounterState
-import json
 from scriberyte.util import json_to_html_with_sections_for_wound_care
 
 class HtmlGenerator:
     """Generates standardized Wound Care HTML reports using scriberyte.util."""
 
-    def generate(self, state: EncounterState, output_path: str):
+    def render(self, state: EncounterState) -> str:
+        """Render the chart HTML for a state."""
         # Convert state to dict for util function
         # We need to ensure the keys match what the LLM generates
-        state_dict = json.loads(state.model_dump_json())
+        state_dict = state.model_dump(mode="json")
+        # History stores reverse patches; show each version's full chart instead of raw ops
+        state_dict['history'] = state.history_with_snapshots()
         
         # Map provider_comments internal key to 'comments' expected by util.py
         if 'provider_comments' in state_dict:
@@ -30,6 +32,10 @@ class HtmlGenerator:
             
         # Generate HTML
         html, _ = json_to_html_with_sections_for_wound_care(state_dict)
+        return html
+
+    def generate(self, state: EncounterState, output_path: str):
+        html = self.render(state)
         
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(html)
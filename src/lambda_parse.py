@@ -78,7 +78,7 @@ def handler(event, context):
     s3_client.put_object(
         Bucket=BUCKET,
         Key=state_key,
-        Body=state.model_dump_json(indent=2).encode("utf-8"),
+        Body=state.__pydantic_serializer__.to_json(state),
         ContentType="application/json",
     )
 
@@ -21,10 +21,17 @@ S3 Output Structure:
   {prefix}/{id}/clinical_data_jsons/           - JSON state files
 """
 import os
-import json
+import asyncio
+import hashlib
+import logging
 import re
+import sqlite3
+import tempfile
+import threading
 import jsonpatch
-from typing import List
+from pydantic import TypeAdapter
+from typing import Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 from .models import EncounterState, WoundDetails, PatientInformation, AppointmentStatus, EMJustification
@@ -32,10 +39,27 @@ from .parser import ClinicalParser
 from .transcriber import Transcriber
 from .html_generator import HtmlGenerator
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 from .scriberyte_client import ScriberyteClient
 from .utils import get_output_basename
 
+logger = logging.getLogger(__name__)
+
+# Validates a whole page of listing rows in one call
+_STATE_LIST_ADAPTER = TypeAdapter(List[EncounterState])
+
+# JSON Patch paths apply_addendum can set directly: /field, /wounds/N/field, /<section>/field
+_FIELD_PATCH_RE = re.compile(r"^/(?:wounds/(\d+)/|(patient_information|em_justification)/)?(\w+)$")
+# Top-level fields the fast path may set; bookkeeping (history, version, ids) is left to jsonpatch
+_PATCHABLE_FIELDS = frozenset(("provider_comments", "treatment_plan", "wounds"))
+
+# Sentinel for "attribute not present" in single-lookup getattr calls
+_MISSING = object()
+
+# Rows validated per batch while iterating the listing
+LIST_PAGE_SIZE = 50
+
 class EncounterManager:
     """Manages the lifecycle of an encounter: storage, updates, and rendering."""
     
@@ -47,7 +71,8 @@ class EncounterManager:
         
         # S3 Configuration
         self.s3_bucket = os.getenv("S3_BUCKET_NAME")
-        self.s3_client = boto3.client('s3') if self.s3_bucket else None
+        # One shared client; the pool is sized for the concurrent sync downloads
+        self.s3_client = boto3.client('s3', config=BotoConfig(max_pool_connections=32)) if self.s3_bucket else None
         self.s3_prefix = os.getenv("S3_OUTPUT_PREFIX", "woundcare")
         
         self.parser = ClinicalParser()
@@ -55,17 +80,120 @@ class EncounterManager:
         self.html_gen = HtmlGenerator()
         self.scriberyte = ScriberyteClient()
 
+        # Chart uploads from the async pipeline run in the background, one
+        # chain per appointment so this process uploads them in save order.
+        # Lambda freezes the process once the handler returns, so upload inline there.
+        self._pending_uploads = {}
+        self._background_uploads = not os.getenv("AWS_LAMBDA_FUNCTION_NAME")
+
+        # Local saves run in worker threads and the watcher processes a scan's
+        # files concurrently, so saves of one appointment take its lock.
+        self._save_locks = {}
+        self._save_locks_guard = threading.Lock()
+        
+        # Listing index: one row per appointment, kept current by save_state /
+        # delete_appointment so list_appointments doesn't rescan every file.
+        self._index_lock = threading.Lock()
+        self._index = sqlite3.connect(os.path.join(storage_dir, "index.db"), check_same_thread=False)
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS appts (id TEXT PRIMARY KEY, created_at TEXT, updated_at TEXT, "
+            "patient_name TEXT, status TEXT, json BLOB)"
+        )
+        self._index.execute("CREATE INDEX IF NOT EXISTS appts_created_at ON appts (created_at)")
+
+        # Validated rows reused across list calls: appointment_id -> (updated_at, EncounterState)
+        self._appt_cache = {}
+        if not self._index.execute("SELECT 1 FROM appts LIMIT 1").fetchone():
+            self._backfill_index()
+
     def _get_path(self, appointment_id: str) -> str:
         return os.path.join(self.storage_dir, f"{appointment_id}.json")
 
+    def _save_lock(self, appointment_id: str) -> threading.Lock:
+        with self._save_locks_guard:
+            return self._save_locks.setdefault(appointment_id, threading.Lock())
+
+    def _write_atomic(self, path: str, data: bytes):
+        """Write via a temp file + os.replace so readers never see a partial file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.storage_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read_state(self, json_path: str) -> EncounterState:
+        """Read and validate a state JSON file."""
+        # Parse + validate in pydantic-core (no intermediate Python dict)
+        with open(json_path, "rb") as f:
+            return EncounterState.model_validate_json(f.read())
+
+    def _index_state(self, state: EncounterState):
+        """Insert or refresh the listing-index row for a state."""
+        row = (
+            state.appointment_id,
+            state.created_at.isoformat(),
+            state.updated_at.isoformat(),
+            state.patient_information.patient_name,
+            state.status.value,
+            state.__pydantic_serializer__.to_json(state),
+        )
+        with self._index_lock, self._index:
+            self._index.execute("INSERT OR REPLACE INTO appts VALUES (?, ?, ?, ?, ?, ?)", row)
+
+    def _read_indexed(self, json_path: str) -> EncounterState:
+        """Read a local state file, indexing it if the listing index has no row for it."""
+        state = self._read_state(json_path)
+        with self._index_lock:
+            indexed = self._index.execute("SELECT 1 FROM appts WHERE id = ?", (state.appointment_id,)).fetchone()
+        if not indexed:
+            self._index_state(state)
+        return state
+
+    def close(self):
+        """Close the listing index connection."""
+        with self._index_lock:
+            self._index.close()
+
+    def _backfill_index(self):
+        """One-time scan that indexes state files written before the index existed."""
+        with os.scandir(self.storage_dir) as it:
+            # DirEntry carries the file type from the directory read; no extra stat per file
+            paths = [entry.path for entry in it if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)]
+
+        def _load_one(path):
+            try:
+                return self._read_state(path)
+            except Exception as e:
+                logger.error("Error indexing %s: %s", os.path.basename(path), e)
+                return None
+
+        # File reads release the GIL, so overlap them across a small pool
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for state in pool.map(_load_one, paths):
+                if state is not None:
+                    self._index_state(state)
+
     def _upload_to_s3(self, local_path: str, s3_key: str):
         """Upload a file to S3 if configured."""
         if self.s3_client and self.s3_bucket:
             try:
                 self.s3_client.upload_file(local_path, self.s3_bucket, s3_key)
-                print(f"Uploaded {local_path} to s3://{self.s3_bucket}/{s3_key}")
+                logger.debug("Uploaded %s to s3://%s/%s", local_path, self.s3_bucket, s3_key)
+            except Exception as e:
+                logger.error("S3 Upload Error: %s", e)
+
+    def _put_to_s3(self, body: bytes, s3_key: str, content_type: str = "application/json"):
+        """Upload in-memory content to S3 if configured."""
+        if self.s3_client and self.s3_bucket:
+            try:
+                self.s3_client.put_object(Bucket=self.s3_bucket, Key=s3_key, Body=body, ContentType=content_type)
+                logger.debug("Uploaded s3://%s/%s", self.s3_bucket, s3_key)
             except Exception as e:
-                print(f"S3 Upload Error: {e}")
+                logger.error("S3 Upload Error: %s", e)
 
     def _download_from_s3(self, s3_key: str, local_path: str) -> bool:
         """Download a file from S3 if it exists."""
@@ -76,7 +204,7 @@ class EncounterManager:
             except ClientError as e:
                 if e.response['Error']['Code'] == "404":
                     return False
-                print(f"S3 Download Error: {e}")
+                logger.error("S3 Download Error: %s", e)
         return False
 
     def _delete_from_s3(self, s3_key: str):
@@ -84,9 +212,9 @@ class EncounterManager:
         if self.s3_client and self.s3_bucket:
             try:
                 self.s3_client.delete_object(Bucket=self.s3_bucket, Key=s3_key)
-                print(f"Deleted s3://{self.s3_bucket}/{s3_key}")
+                logger.debug("Deleted s3://%s/%s", self.s3_bucket, s3_key)
             except Exception as e:
-                print(f"S3 Delete Error: {e}")
+                logger.error("S3 Delete Error: %s", e)
 
     def _copy_s3_object(self, source_key: str, dest_key: str):
         """Copy an object within the bucket."""
@@ -96,10 +224,27 @@ class EncounterManager:
 
     def move_s3_object(self, source_key: str, dest_key: str):
         """Move an object (Copy + Delete)."""
-        print(f"Moving S3 object locally: {source_key} -> {dest_key}")
+        logger.debug("Moving S3 object: %s -> %s", source_key, dest_key)
         self._copy_s3_object(source_key, dest_key)
         self._delete_from_s3(source_key)
 
+    def get_version_snapshot(self, state: EncounterState, version: int) -> dict:
+        """Reconstruct the chart fields as they were at a given version.
+
+        Walks history from newest to oldest, applying each entry's reverse
+        patch, and stops at the requested version. Older entries that still
+        carry a full 'snapshot' are used as-is.
+        """
+        # chart is a fresh dump, so patches can apply in place instead of
+        # deep-copying the whole chart per step (jsonpatch copies op values)
+        chart = state.chart_view()
+        for entry in reversed(state.history):
+            if entry.get("version") == version:
+                return entry.get("snapshot", chart)
+            if "reverse_patch" in entry:
+                chart = jsonpatch.JsonPatch(entry["reverse_patch"]).apply(chart, in_place=True)
+        raise KeyError(f"Version {version} not found in history of {state.appointment_id}")
+
     def create_appointment(self, req: PatientInformation) -> EncounterState:
         """Create a new booked appointment."""
         state = EncounterState(
@@ -109,37 +254,121 @@ class EncounterManager:
         self.save_state(state)
         return state
 
-    def list_appointments(self) -> List[EncounterState]:
-        """List all appointments across all providers by scanning for clinical_data_jsons/*.json"""
-        # 1. Sync list from S3 if available
-        if self.s3_client and self.s3_bucket:
-            try:
-                paginator = self.s3_client.get_paginator('list_objects_v2')
-                # We scan the root prefix to find all provider folders
-                for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=f"{self.s3_prefix}/"):
+    def sync_appointments_from_s3(self):
+        """Download clinical_data_jsons/*.json files from S3 that aren't present locally.
+
+        Only each provider's clinical_data_jsons/ folder is listed, not the
+        audio, transcripts and HTML around it. Every sync lists the whole
+        folder: chart keys are appointment IDs or late-arriving recordings,
+        so there is no sort order a cursor could rely on.
+        """
+        if not (self.s3_client and self.s3_bucket):
+            return
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+
+            # 1. Discover provider folders (one delimiter listing, no object scan)
+            provider_prefixes = []
+            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=f"{self.s3_prefix}/", Delimiter="/"):
+                provider_prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+
+            # 2. List each provider's chart folder and collect the charts missing locally
+            to_fetch = []
+            for provider_prefix in provider_prefixes:
+                for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=f"{provider_prefix}clinical_data_jsons/"):
                     for obj in page.get('Contents', []):
                         key = obj['Key']
-                        # Look for JSON files in a 'clinical_data_jsons' folder
-                        if key.endswith(".json") and "/clinical_data_jsons/" in key:
+                        if key.endswith(".json"):
                             appt_id = key.split('/')[-1].replace(".json", "")
                             local_path = self._get_path(appt_id)
                             if not os.path.exists(local_path):
-                                self._download_from_s3(key, local_path)
-            except Exception as e:
-                print(f"Error syncing list from S3: {e}")
-
-        # 2. Scrape local data folder
-        appointments = []
-        for filename in os.listdir(self.storage_dir):
-            if filename.endswith(".json"):
-                path = os.path.join(self.storage_dir, filename)
+                                to_fetch.append((key, local_path))
+
+            # 3. Fetch missing charts concurrently (network-bound, boto3 clients are thread-safe)
+            def _fetch_one(item):
+                key, local_path = item
+                if self._download_from_s3(key, local_path):
+                    self._index_state(self._read_state(local_path))
+
+            if to_fetch:
+                with ThreadPoolExecutor(max_workers=min(16, len(to_fetch))) as pool:
+                    list(pool.map(_fetch_one, to_fetch))
+        except Exception as e:
+            logger.error("Error syncing list from S3: %s", e)
+
+    def appointments_etag(self) -> str:
+        """Weak ETag for the listing; changes whenever an appointment is saved, added or removed."""
+        with self._index_lock:
+            rows = self._index.execute("SELECT id, updated_at FROM appts ORDER BY id").fetchall()
+        digest = hashlib.blake2b(digest_size=16)
+        for appt_id, updated_at in rows:
+            digest.update(f"{appt_id}\0{updated_at}\n".encode("utf-8"))
+        return f'W/"{digest.hexdigest()}"'
+
+    def iter_appointments(self, limit: Optional[int] = None) -> Iterator[EncounterState]:
+        """Yield appointments newest first from the listing index, validating lazily page by page."""
+        query = "SELECT id, updated_at FROM appts ORDER BY created_at DESC"
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        with self._index_lock:
+            rows = self._index.execute(query, params).fetchall()
+
+        # Only re-validate rows that changed, one small batch per page
+        for i in range(0, len(rows), LIST_PAGE_SIZE):
+            page = rows[i:i + LIST_PAGE_SIZE]
+            stale = [(appt_id, updated_at) for appt_id, updated_at in page
+                     if self._appt_cache.get(appt_id, (None,))[0] != updated_at]
+            if stale:
+                self._refresh_appt_cache(stale)
+            for appt_id, updated_at in page:
+                cached = self._appt_cache.get(appt_id)
+                if cached and cached[0] == updated_at:
+                    yield cached[1]
+
+    def list_appointments(self, sync_s3: bool = True, limit: Optional[int] = None) -> List[EncounterState]:
+        """List all appointments across all providers, newest first, from the listing index."""
+        # 1. Sync list from S3 if available
+        if sync_s3:
+            self.sync_appointments_from_s3()
+
+        # 2. Read the listing index
+        appointments = list(self.iter_appointments(limit))
+
+        # Forget rows that were removed since the last call
+        if limit is None:
+            live = {a.appointment_id for a in appointments}
+            for appt_id in self._appt_cache.keys() - live:
+                self._appt_cache.pop(appt_id, None)
+        return appointments
+
+    def _refresh_appt_cache(self, stale):
+        """Load and validate changed index rows in one batch: [(id, updated_at), ...]."""
+        blobs = {}
+        ids = [appt_id for appt_id, _ in stale]
+        with self._index_lock:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                query = f"SELECT id, json FROM appts WHERE id IN ({','.join('?' * len(chunk))})"
+                blobs.update(self._index.execute(query, chunk).fetchall())
+        stale = [(appt_id, updated_at) for appt_id, updated_at in stale if appt_id in blobs]
+
+        # One pydantic-core call for the whole batch; fall back per row to isolate bad rows
+        try:
+            states = _STATE_LIST_ADAPTER.validate_json(b"[" + b",".join(blobs[appt_id] for appt_id, _ in stale) + b"]")
+        except Exception:
+            states = []
+            for appt_id, _ in stale:
                 try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        appointments.append(EncounterState.model_validate(data))
+                    states.append(EncounterState.model_validate_json(blobs[appt_id]))
                 except Exception as e:
-                    print(f"Error loading {filename}: {e}")
-        return sorted(appointments, key=lambda x: x.created_at, reverse=True)
+                    logger.error("Error loading %s: %s", appt_id, e)
+                    states.append(None)
+
+        for (appt_id, updated_at), state in zip(stale, states):
+            if state is not None:
+                self._appt_cache[appt_id] = (updated_at, state)
 
     def get_appointment(self, appointment_id: str) -> EncounterState:
         return self.load_state(appointment_id)
@@ -150,20 +379,17 @@ class EncounterManager:
         
         # 1. Try exact local match
         if os.path.exists(local_path):
-            with open(local_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return EncounterState.model_validate(data)
+            return self._read_indexed(local_path)
 
         # 2. Try UUID-based lookup locally
         if allow_uuid:
             uuid_match = re.search(r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', appointment_id, re.IGNORECASE)
             if uuid_match:
                 uuid = uuid_match.group(1).lower()
-                for f_name in os.listdir(self.storage_dir):
-                    if f_name.endswith(".json") and uuid in f_name.lower():
-                        with open(os.path.join(self.storage_dir, f_name), "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                            return EncounterState.model_validate(data)
+                with os.scandir(self.storage_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith(".json") and uuid in entry.name.lower() and entry.is_file(follow_symlinks=False):
+                            return self._read_indexed(entry.path)
 
         # 3. Try S3 lookup
         if self.s3_client and self.s3_bucket:
@@ -171,25 +397,30 @@ class EncounterManager:
                 # Direct lookup if provider is known
                 s3_key = f"{self.s3_prefix}/{provider_id}/clinical_data_jsons/{appointment_id}.json"
                 if self._download_from_s3(s3_key, local_path):
-                     with open(local_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        return EncounterState.model_validate(data)
+                    state = self._read_state(local_path)
+                    self._index_state(state)
+                    return state
             else:
                 # SEARCH fallback: This happens if app.py calls without provider context
-                print(f"   [Debug] Searching S3 for state: {appointment_id} across all providers...")
+                logger.debug("Searching S3 for state: %s across all providers...", appointment_id)
                 paginator = self.s3_client.get_paginator('list_objects_v2')
                 for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=f"{self.s3_prefix}/"):
                     for obj in page.get('Contents', []):
                         if obj['Key'].endswith(f"/clinical_data_jsons/{appointment_id}.json"):
                             if self._download_from_s3(obj['Key'], local_path):
-                                with open(local_path, "r", encoding="utf-8") as f:
-                                    data = json.load(f)
-                                    return EncounterState.model_validate(data)
+                                state = self._read_state(local_path)
+                                self._index_state(state)
+                                return state
 
         raise FileNotFoundError(f"Appointment {appointment_id} (or UUID equivalent) not found.")
 
-    async def create_from_transcript(self, transcript: str, appointment_id: str, provider_id: str = "default", original_filename: str = None, pre_patient_info: PatientInformation = None, pre_patient_context: str = "") -> EncounterState:
-        """Parse transcript via LLM, create/update EncounterState, save and upload chart."""
+    async def create_from_transcript(self, transcript: str, appointment_id: str, provider_id: str = "default", original_filename: str = None, pre_patient_info: PatientInformation = None, pre_patient_context: str = "", now: datetime = None) -> EncounterState:
+        """Parse transcript via LLM, create/update EncounterState, save and upload chart.
+
+        `now` is the request timestamp, used for the history entry; updated_at is
+        stamped when the state is saved.
+        """
+        now = now or datetime.now()
         print(f"   -> Parsing transcript for {appointment_id}...")
         parsed = await self.parser.parse_transcript(transcript)
         
@@ -198,7 +429,7 @@ class EncounterManager:
         
         # Try to load existing EXACT state, or create new one
         try:
-            state = self.load_state(appointment_id, allow_uuid=False)
+            state = await asyncio.to_thread(self.load_state, appointment_id, allow_uuid=False)
             print(f"   -> Loaded existing state (v{state.version}) for {appointment_id}")
             state.version += 1
             state.updated_at = datetime.now()
@@ -207,6 +438,7 @@ class EncounterManager:
         except FileNotFoundError:
             state = EncounterState(appointment_id=appointment_id, provider_id=provider_id)
             print(f"   -> Creating new state for {appointment_id}")
+        previous_chart = state.chart_view()
         
         if original_filename:
             state.original_audio_filename = original_filename
@@ -215,7 +447,7 @@ class EncounterManager:
         scriberyte_info, patient_context = pre_patient_info, pre_patient_context
         
         if not scriberyte_info and self.scriberyte.is_configured():
-            scriberyte_info, patient_context = self.scriberyte.fetch_patient_info(appointment_id)
+            scriberyte_info, patient_context = await asyncio.to_thread(self.scriberyte.fetch_patient_info, appointment_id)
         
         if scriberyte_info:
             state.patient_information = scriberyte_info
@@ -234,17 +466,20 @@ class EncounterManager:
         # Step 2: Overlay any additional info extracted from transcript (fills gaps only)
         patient_info = parsed.get("patient_information", {})
         if patient_info:
+            current = state.patient_information
             for field, value in patient_info.items():
-                if value and hasattr(state.patient_information, field):
-                    # Only set if Scriberyte didn't already provide this field
-                    existing = getattr(state.patient_information, field, None)
-                    if not existing:
-                        setattr(state.patient_information, field, value)
+                if not value:
+                    continue
+                # One lookup: unknown fields come back as the sentinel and are skipped.
+                # Only set if Scriberyte didn't already provide this field
+                existing = getattr(current, field, _MISSING)
+                if existing is not _MISSING and not existing:
+                    setattr(current, field, value)
         
         # Update wounds
         wounds_data = parsed.get("wounds", [])
         if wounds_data:
-            state.wounds = [WoundDetails(**w) for w in wounds_data]
+            state.wounds = [WoundDetails.model_validate(w) for w in wounds_data]
         
         # Update other fields
         # Note: LLM prompt returns "comments" key, not "provider_comments"
@@ -263,36 +498,88 @@ class EncounterManager:
         state.history.append({
             "version": state.version,
             "type": "initial_dictation",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "transcript": transcript,
-            "snapshot": {
-                "patient_info": state.patient_information.model_dump(),
-                "wounds": [w.model_dump() for w in state.wounds],
-                "provider_comments": state.provider_comments,
-                "treatment_plan": state.treatment_plan
-            }
+            "reverse_patch": jsonpatch.make_patch(state.chart_view(), previous_chart).patch
         })
         
         state.status = AppointmentStatus.RECORDING_SAVED
-        self.save_state(state)
+        # Chart generation + S3 uploads are blocking; keep them off the event loop
+        await self.save_state_async(state)
         print(f"   -> Chart saved for {appointment_id} (v{state.version})")
         return state
 
-    async def apply_addendum(self, appointment_id: str, transcript: str, provider_id: str = "default", original_filename: str = None) -> EncounterState:
-        """Apply an addendum transcript as a patch to existing state."""
+    @staticmethod
+    def _apply_field_patches(state: EncounterState, patch_ops: list):
+        """Apply replace-only patches field by field on a copy of the state.
+
+        Handles /provider_comments, /treatment_plan, /wounds, /wounds/N/field,
+        /patient_information/field and /em_justification/field; each value runs
+        through pydantic's validate_assignment (which also re-runs WoundDetails'
+        metric calculation).
+        Returns None when an op needs the full jsonpatch path.
+        """
+        targets = []
+        for op in patch_ops:
+            if op.get("op") != "replace" or "value" not in op:
+                return None
+            m = _FIELD_PATCH_RE.match(op.get("path", ""))
+            if not m:
+                return None
+            targets.append((m.groups(), op["value"]))
+
+        new_state = state.model_copy()
+        new_state.wounds = list(state.wounds)
+        copies = {}
+        for (index, section, field), value in targets:
+            if index is not None:
+                index = int(index)
+                if index >= len(new_state.wounds):
+                    return None
+                key = ("wounds", index)
+                if key not in copies:
+                    copies[key] = new_state.wounds[index] = new_state.wounds[index].model_copy()
+            elif section is not None:
+                key = (section, None)
+                if key not in copies:
+                    copies[key] = getattr(new_state, section).model_copy()
+                    setattr(new_state, section, copies[key])
+            elif field in _PATCHABLE_FIELDS:
+                key = None
+            else:
+                return None
+            target = copies[key] if key else new_state
+            if field not in type(target).model_fields:
+                return None
+            target.__pydantic_validator__.validate_assignment(target, field, value)
+        return new_state
+
+    async def apply_addendum(self, appointment_id: str, transcript: str, provider_id: str = "default", original_filename: str = None, now: datetime = None) -> EncounterState:
+        """Apply an addendum transcript as a patch to existing state (`now` as in create_from_transcript)."""
+        now = now or datetime.now()
         print(f"   -> Applying addendum for {appointment_id}...")
-        state = self.load_state(appointment_id, allow_uuid=True, provider_id=provider_id)
+        state = await asyncio.to_thread(self.load_state, appointment_id, allow_uuid=True, provider_id=provider_id)
+        previous_chart = state.chart_view()
+        
+        # One JSON-mode dump serves both the LLM prompt and the patch target.
+        # History is left out so the K-th addendum doesn't re-serialize K entries.
+        state_dict = state.model_dump(mode="json", exclude={"history"})
         
         # Generate patch using LLM
         patch_ops = await self.parser.generate_patch(
-            state.model_dump(), transcript
+            state_dict, transcript
         )
         
         if patch_ops:
             try:
-                state_dict = json.loads(state.model_dump_json())
-                patched = jsonpatch.apply_patch(state_dict, patch_ops)
-                state = EncounterState.model_validate(patched)
+                # Field-level replaces validate only the touched fields;
+                # anything structural goes through the full dump/re-validate.
+                patched_state = self._apply_field_patches(state, patch_ops)
+                if patched_state is None:
+                    patched = jsonpatch.JsonPatch(patch_ops).apply(state_dict, in_place=True)
+                    patched["history"] = state.history
+                    patched_state = EncounterState.model_validate(patched)
+                state = patched_state
                 print(f"   -> Patch applied successfully ({len(patch_ops)} ops)")
             except Exception as e:
                 print(f"   -> Patch failed ({e}), appending as comment instead")
@@ -310,24 +597,22 @@ class EncounterManager:
         state.history.append({
             "version": state.version,
             "type": "addendum",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "transcript": transcript,
             "patch_ops": patch_ops,
-            "snapshot": {
-                "patient_info": state.patient_information.model_dump(),
-                "wounds": [w.model_dump() for w in state.wounds],
-                "provider_comments": state.provider_comments,
-                "treatment_plan": state.treatment_plan
-            }
+            "reverse_patch": jsonpatch.make_patch(state.chart_view(), previous_chart).patch
         })
         
-        self.save_state(state)
+        # Chart generation + S3 uploads are blocking; keep them off the event loop
+        await self.save_state_async(state)
         print(f"   -> Addendum chart saved for {appointment_id} (v{state.version})")
         return state
 
     def delete_appointment(self, appointment_id: str):
         """Delete appointment from local storage."""
         local_path = self._get_path(appointment_id)
+        with self._index_lock, self._index:
+            self._index.execute("DELETE FROM appts WHERE id = ?", (appointment_id,))
         if os.path.exists(local_path):
             os.remove(local_path)
         html_path = os.path.join(self.storage_dir, f"{appointment_id}.html")
@@ -335,19 +620,66 @@ class EncounterManager:
             os.remove(html_path)
 
     def save_state(self, state: EncounterState):
+        self._sync_s3(*self._write_local(state))
+
+    async def save_state_async(self, state: EncounterState):
+        """Write the chart locally, then push it to S3 without making the caller wait."""
+        artifacts = await asyncio.to_thread(self._write_local, state)
+        if not (self.s3_client and self.s3_bucket):
+            return
+        if not self._background_uploads:
+            await asyncio.to_thread(self._sync_s3, *artifacts)
+            return
+
+        appointment_id = state.appointment_id
+        previous = self._pending_uploads.get(appointment_id)
+
+        async def _upload():
+            if previous:
+                await asyncio.wait({previous})
+            await asyncio.to_thread(self._sync_s3, *artifacts)
+
+        task = asyncio.create_task(_upload())
+        self._pending_uploads[appointment_id] = task
+
+        def _forget(t):
+            if self._pending_uploads.get(appointment_id) is t:
+                del self._pending_uploads[appointment_id]
+
+        task.add_done_callback(_forget)
+
+    async def wait_for_uploads(self, appointment_id: str = None):
+        """Wait for background S3 uploads: one appointment's chain, or all of them (e.g. on shutdown)."""
+        if appointment_id is not None:
+            task = self._pending_uploads.get(appointment_id)
+            if task:
+                await asyncio.wait({task})
+            return
+        while self._pending_uploads:
+            await asyncio.gather(*list(self._pending_uploads.values()), return_exceptions=True)
+
+    def _write_local(self, state: EncounterState):
+        """Save the JSON state, index row and HTML chart locally; returns the artifacts for _sync_s3."""
+        with self._save_lock(state.appointment_id):
+            return self._write_local_locked(state)
+
+    def _write_local_locked(self, state: EncounterState):
         state.updated_at = datetime.now()
         
         # 1. Save JSON locally (Always keep for state management)
         json_path = self._get_path(state.appointment_id)
-        with open(json_path, "w", encoding="utf-8") as f:
-            f.write(state.model_dump_json(indent=2))
+        data = state.__pydantic_serializer__.to_json(state)
+        self._write_atomic(json_path, data)
+        self._index_state(state)
         
         # 2. Generate HTML report locally (with retry for file locks)
         html_path = os.path.join(self.storage_dir, f"{state.appointment_id}.html")
+        html = None
         
         for i in range(3):
             try:
-                self.html_gen.generate(state, html_path)
+                html = self.html_gen.render(state).encode("utf-8")
+                self._write_atomic(html_path, html)
                 break
             except Exception as e:
                 if i == 2:
@@ -355,32 +687,42 @@ class EncounterManager:
                 else: 
                     print(f"   [Warning] Save attempt {i+1} failed ({e}), retrying...")
                     time.sleep(1)
-        
-        # 3. Upload artifacts to S3 with Provider Folder
+
         # Naming convention: same base name as original audio, only extension changes
         #   {base_name}.html  (chart)      — in chatgpt_htmls/{appointment_id}/
         #   {base_name}.json  (clinical data) — in clinical_data_jsons/
         #   {base_name}.txt   (transcript)  — uploaded in process_s3_audio_to_state
         #   {base_name}.mp3   (audio)       — original from Scriberyte
         # No history/ subfolder needed: version is embedded in filename (chart-1, addendum-1)
-        
         provider_id = getattr(state, "provider_id", "default")
-        base_chart_path = f"{self.s3_prefix}/{provider_id}/chatgpt_htmls"
-        
+
         # Determine output name: strip original audio extension, replace with .html/.json
         if state.original_audio_filename:
             base_name = get_output_basename(state.original_audio_filename)
         else:
             base_name = state.appointment_id
 
+        # The S3 copies reuse the bytes written above, so a later save of the
+        # same appointment can't leak into a pending upload.
+        if not (self.s3_client and self.s3_bucket):
+            html = data = None
+        return provider_id, base_name, html, data
+
+    def _sync_s3(self, provider_id: str, base_name: str, html: Optional[bytes], snapshot: Optional[bytes]):
+        """Upload the chart HTML and clinical data JSON to the provider's S3 folder."""
         # Upload HTML chart
-        s3_html_key = f"{base_chart_path}/{base_name}.html"
-        self._upload_to_s3(html_path, s3_html_key)
+        if html is not None:
+            self._put_to_s3(html, f"{self.s3_prefix}/{provider_id}/chatgpt_htmls/{base_name}.html", content_type="text/html")
 
         # Upload Clinical data JSON — same base name, .json extension
-        s3_json_key = f"{self.s3_prefix}/{provider_id}/clinical_data_jsons/{base_name}.json"
-        self._upload_to_s3(json_path, s3_json_key)
+        if snapshot is not None:
+            self._put_to_s3(snapshot, f"{self.s3_prefix}/{provider_id}/clinical_data_jsons/{base_name}.json")
 
+    def _save_transcript(self, transcript: str, transcript_path: str, s3_key: str):
+        """Write a transcript locally, then upload it to S3 (if configured)."""
+        with open(transcript_path, "w", encoding="utf-8") as f:
+            f.write(transcript)
+        self._upload_to_s3(transcript_path, s3_key)
 
     async def process_audio_to_state(self, audio_path: str, appointment_id: str, provider_id: str = "default") -> EncounterState:
         """Helper: Audio -> Transcript -> State with S3 storage (Conditional on Success)."""
@@ -392,16 +734,20 @@ class EncounterManager:
         fname = os.path.basename(audio_path)
         base_name = get_output_basename(fname)
 
-        self._upload_to_s3(audio_path, f"{self.s3_prefix}/{provider_id}/audio/{fname}")
+        # Audio upload and transcript write + upload run off the event loop, side by side
+        # and overlap the LLM call below; neither depends on the chart.
         transcript_path = os.path.join(self.storage_dir, f"{appointment_id}.txt")
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript)
-        
-        # Transcript: {base_name}.txt
-        self._upload_to_s3(transcript_path, f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt")
+        artifacts = asyncio.gather(
+            asyncio.to_thread(self._upload_to_s3, audio_path, f"{self.s3_prefix}/{provider_id}/audio/{fname}"),
+            # Transcript: {base_name}.txt
+            asyncio.to_thread(self._save_transcript, transcript, transcript_path, f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt"),
+        )
         
-        # 3. Process to chart
-        return await self.create_from_transcript(transcript, appointment_id, provider_id=provider_id, original_filename=fname)
+        # 3. Process to chart while the artifacts upload
+        try:
+            return await self.create_from_transcript(transcript, appointment_id, provider_id=provider_id, original_filename=fname)
+        finally:
+            await artifacts
 
     async def process_audio_addendum_to_state(self, audio_path: str, appointment_id: str, provider_id: str = "default") -> EncounterState:
         """Helper: Addendum Audio -> Transcript -> Patch with S3 archival (Conditional)."""
@@ -412,16 +758,20 @@ class EncounterManager:
         fname = os.path.basename(audio_path)
         base_name = get_output_basename(fname)
 
-        self._upload_to_s3(audio_path, f"{self.s3_prefix}/{provider_id}/audio/{fname}")
+        # Audio upload and transcript write + upload run off the event loop, side by side
+        # and overlap the LLM call below; neither depends on the chart.
         transcript_path = os.path.join(self.storage_dir, f"{base_name}.txt")
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript)
-
-        # Transcript: {base_name}.txt
-        self._upload_to_s3(transcript_path, f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt")
+        artifacts = asyncio.gather(
+            asyncio.to_thread(self._upload_to_s3, audio_path, f"{self.s3_prefix}/{provider_id}/audio/{fname}"),
+            # Transcript: {base_name}.txt
+            asyncio.to_thread(self._save_transcript, transcript, transcript_path, f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt"),
+        )
         
-        # 3. Apply addendum
-        return await self.apply_addendum(appointment_id, transcript, provider_id=provider_id, original_filename=fname)
+        # 3. Apply addendum while the artifacts upload
+        try:
+            return await self.apply_addendum(appointment_id, transcript, provider_id=provider_id, original_filename=fname)
+        finally:
+            await artifacts
 
     async def process_s3_audio_to_state(self, s3_key: str, appointment_id: str, provider_id: str = "default") -> EncounterState:
         """Downloads audio from S3, processes it, and updates state + artifacts."""
@@ -436,26 +786,27 @@ class EncounterManager:
             # 2. Transcribe
             transcript = await self.transcriber.transcribe(temp_audio_path)
             
-            # 3. Save & Upload Transcript — same base name as audio, .txt extension
+            # 3. Output names share the audio's base name (transcript goes up straight from memory)
             fname = os.path.basename(s3_key)
             base_name = get_output_basename(fname)
 
-            transcript_path = os.path.join(self.storage_dir, f"{base_name}.txt")
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(transcript)
-
-            # Transcript: {base_name}.txt
-            self._upload_to_s3(transcript_path, f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt")
-            
             # 4. Copy Audio to Provider Folder (preserves original name)
             dest_audio_key = f"{self.s3_prefix}/{provider_id}/audio/{fname}"
+
+            # Transcript: {base_name}.txt — uploaded with the audio copy while the chart is generated
+            artifacts = [asyncio.to_thread(self._put_to_s3, transcript.encode("utf-8"), f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt", content_type="text/plain")]
             if s3_key != dest_audio_key:
-                 self._copy_s3_object(s3_key, dest_audio_key)
-            
+                artifacts.append(asyncio.to_thread(self._copy_s3_object, s3_key, dest_audio_key))
+            artifacts = asyncio.gather(*artifacts)
+
             # 5. Process (Create Chart) — save_state will upload .html and .json with same base name
-            state = await self.create_from_transcript(transcript, appointment_id, provider_id=provider_id, original_filename=fname)
-            
-            # 6. ONLY delete from inbox if the chart was successfully generated
+            try:
+                state = await self.create_from_transcript(transcript, appointment_id, provider_id=provider_id, original_filename=fname)
+            finally:
+                await artifacts
+
+            # 6. ONLY delete from inbox once the chart has been generated and uploaded
+            await self.wait_for_uploads(state.appointment_id)
             if s3_key != dest_audio_key and self.s3_client:
                  try:
                      self.s3_client.delete_object(Bucket=self.s3_bucket, Key=s3_key)
@@ -473,7 +824,8 @@ class EncounterManager:
     async def process_s3_addendum_to_state(self, s3_key: str, appointment_id: str, provider_id: str = "default") -> EncounterState:
         """Downloads addendum audio from S3, processes it, and patches state."""
         # 1. Download audio
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S") # Unique timestamp
+        now = datetime.now()
+        ts = now.strftime("%Y%m%d_%H%M%S") # Unique timestamp
         original_ext = os.path.splitext(s3_key)[1] or ".wav"
         
         # Temp local file
@@ -486,25 +838,27 @@ class EncounterManager:
             # 2. Transcribe
             transcript = await self.transcriber.transcribe(temp_audio_path)
             
-            # 3. Save & Upload Transcript — same base name as audio, .txt extension
+            # 3. Output names share the audio's base name (transcript goes up straight from memory)
             fname = os.path.basename(s3_key)
             base_name = get_output_basename(fname)
 
-            transcript_path = os.path.join(self.storage_dir, f"{base_name}.txt")
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                f.write(transcript)
-
-            # Transcript: {base_name}.txt
-            self._upload_to_s3(transcript_path, f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt")
-            
             # 4. Copy Audio to provider folder (preserves original name with -addendum- marker)
             dest_audio_key = f"{self.s3_prefix}/{provider_id}/audio/{fname}"
-            self._upload_to_s3(temp_audio_path, dest_audio_key)
+
+            # Transcript: {base_name}.txt — uploaded with the audio while the addendum is applied
+            artifacts = asyncio.gather(
+                asyncio.to_thread(self._put_to_s3, transcript.encode("utf-8"), f"{self.s3_prefix}/{provider_id}/transcribed-speaker-label/{base_name}.txt", content_type="text/plain"),
+                asyncio.to_thread(self._upload_to_s3, temp_audio_path, dest_audio_key),
+            )
 
             # 5. Apply Addendum — save_state will upload .html and .json with same base name
-            state = await self.apply_addendum(appointment_id, transcript, provider_id=provider_id, original_filename=fname)
+            try:
+                state = await self.apply_addendum(appointment_id, transcript, provider_id=provider_id, original_filename=fname, now=now)
+            finally:
+                await artifacts
 
-            # 6. Delete original from inbox ONLY on success
+            # 6. Delete original from inbox ONLY once the chart has been generated and uploaded
+            await self.wait_for_uploads(state.appointment_id)
             if self.s3_client:
                 try:
                     self.s3_client.delete_object(Bucket=self.s3_bucket, Key=s3_key)
@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 import uuid
 import re
+import jsonpatch
 
 from enum import Enum
 
@@ -148,6 +149,34 @@ class EncounterState(BaseModel):
     # Store the original transcripts and addendums
     history: List[Dict[str, Any]] = Field(default_factory=list)
 
+    def chart_view(self) -> Dict[str, Any]:
+        """The chart fields tracked per version in history."""
+        return {
+            "patient_info": self.patient_information.model_dump(mode="json"),
+            "wounds": [w.model_dump(mode="json") for w in self.wounds],
+            "provider_comments": self.provider_comments,
+            "treatment_plan": self.treatment_plan
+        }
+
+    def history_with_snapshots(self) -> List[Dict[str, Any]]:
+        """History entries with each 'reverse_patch' expanded into the full chart 'snapshot'.
+
+        Rebuilt newest to oldest from the current chart; older entries that
+        already carry a snapshot are returned as they are.
+        """
+        chart = self.chart_view()
+        entries = []
+        for entry in reversed(self.history):
+            reverse_patch = entry.get("reverse_patch")
+            if reverse_patch is not None:
+                entry = {k: v for k, v in entry.items() if k != "reverse_patch"}
+                entry["snapshot"] = chart
+                # apply_patch returns a copy, so the snapshot above is left intact
+                chart = jsonpatch.apply_patch(chart, reverse_patch)
+            entries.append(entry)
+        entries.reverse()
+        return entries
+
 class AddendumRequest(BaseModel):
     appointment_id: str
     transcript: str
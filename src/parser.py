@@ -19,8 +19,9 @@ Model Strategy:
   Fallback2: gemini-2.0-flash
   Automatically retries with next model on failure.
 """
-import json
 import os
+import re
+import orjson
 from typing import Dict, Any, List, Optional
 from google import genai
 from dotenv import load_dotenv
@@ -28,9 +29,101 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from .prompts import INTENT_EXTRACTION_PROMPT, ADDENDUM_PATCH_PROMPT  # noqa: E402
-from .abbreviations import get_abbreviation_markdown  # noqa: E402
+from .abbreviations import ABBREVIATION_STORE, get_abbreviation_markdown  # noqa: E402
 from .utils import clean_narrative_text  # noqa: E402
 
+# The abbreviation table never changes at runtime, so it is resolved into both
+# templates once; only the per-request slots are left for .format().
+_INTENT_TEMPLATE = INTENT_EXTRACTION_PROMPT.replace("{abbreviations_list}", get_abbreviation_markdown())
+_ADDENDUM_TEMPLATE = ADDENDUM_PATCH_PROMPT.replace("{abbreviations_list}", get_abbreviation_markdown())
+
+# Normalization rules for _post_process_json, compiled once. Rules are applied
+# in order, exactly as listed, so earlier replacements can shadow later ones.
+# The combined trigger lets strings that match no rule skip the whole list.
+def _compile_rules(rules: Dict[str, str]):
+    trigger = re.compile("|".join(re.escape(old) for old in rules), re.IGNORECASE)
+    return trigger, [(re.compile(re.escape(old), re.IGNORECASE), new) for old, new in rules.items()]
+
+# 1. Global unit normalization (safe for all fields)
+_GLOBAL_TRIGGER, _GLOBAL_NORM = _compile_rules({
+    "centimeters": "cm",
+    "centimeter": "cm",
+    "square centimeters": "sq cm",
+    "cubic centimeters": "cm³",
+    " %": "%",
+    " .": ".",
+})
+
+# 2. Field-specific normalization (ONLY for measurements/structured fields)
+_MEASUREMENT_FIELDS = frozenset({"measurements", "tunnels", "max_depth", "undermining", "area_sq_cm", "volume_cu_cm"})
+_STRUCT_TRIGGER, _STRUCT_NORM = _compile_rules({
+    ".point": ".",
+    " point ": ".",
+    " by ": " x ",
+    ";": ".",
+})
+# Fix dimensions: "4. 3. 1" -> "4 x 3 x 1"
+_DIMENSION_RE = re.compile(r'(\d+)\.\s+(\d+)')
+
+# 3. Narrative cleanup: abbreviation expansion (safety net)
+_NARRATIVE_FIELDS = frozenset({"clinical_summary", "treatment_plan", "comments"})
+# STRICT MATCHING: Word boundary only. This prevents "TEST3" matching "ST3"
+# but allows "D" to match " D " (as a standalone letter/symbol).
+_ABBREVIATION_RULES = [
+    (re.compile(r'\b' + re.escape(short_code) + r'\b', re.IGNORECASE), full_term, full_term.lower())
+    for items in ABBREVIATION_STORE.values()
+    for short_code, full_term in items.items()
+]
+_ABBREVIATION_TRIGGER = re.compile(
+    r'\b(?:' + "|".join(re.escape(code) for items in ABBREVIATION_STORE.values() for code in items) + r')\b',
+    re.IGNORECASE,
+)
+
+
+# Markdown code fence around the model's JSON: ```json ... ``` or ``` ... ```
+_FENCE_RE = re.compile(r'\s*```(?:json)?\s*(.*?)\s*(?:```|$)', re.DOTALL)
+
+
+def _extract_json(text: str) -> Any:
+    """Parse the JSON body of an LLM response, stripping a surrounding code fence if present."""
+    m = _FENCE_RE.match(text)
+    return orjson.loads(m.group(1) if m else text)
+
+
+def _normalize_text(text: str, key: Optional[str]) -> str:
+    """Normalize one string value; `key` is the JSON field it came from."""
+    res = text
+    
+    # 1. Global Unit Normalization (Safe for all fields)
+    if _GLOBAL_TRIGGER.search(res):
+        for pattern, new in _GLOBAL_NORM:
+            res = pattern.sub(new, res)
+
+    # 2. Field-Specific Normalization (ONLY for measurements/structured fields)
+    if key in _MEASUREMENT_FIELDS:
+        if _STRUCT_TRIGGER.search(res):
+            for pattern, new in _STRUCT_NORM:
+                res = pattern.sub(new, res)
+        
+        # Fix dimensions: "4. 3. 1" -> "4 x 3 x 1"
+        res = _DIMENSION_RE.sub(r'\1 x \2', res)
+    
+    # 3. Narrative Cleanup (Fix unintended "x" separators and common mis-hears)
+    if key in _NARRATIVE_FIELDS or key is None:
+        # A. Apply Abbreviation Expansion (Safety Net)
+        if _ABBREVIATION_TRIGGER.search(res):
+            for pattern, full_term, full_term_lower in _ABBREVIATION_RULES:
+                # Only replace if the full term isn't already immediately there.
+                # This crude check helps prevent "Stage 3 Pressure Injury Pressure Injury"
+                # but follows the user rule: "convert short form to long form"
+                if pattern.search(res) and full_term_lower not in res.lower():
+                    res = pattern.sub(full_term, res)
+
+        res = clean_narrative_text(res)
+    
+    return res.strip()
+
+
 class ClinicalParser:
     """Uses LLM to extract structured clinical intent from transcripts using google-genai SDK."""
     
@@ -51,9 +144,11 @@ class ClinicalParser:
             model_id = self.model_names[self.current_model_idx]
             try:
                 # New SDK Syntax: client.aio.models.generate_content
+                # Both prompts expect bare JSON back, so ask for it directly
                 response = await self.client.aio.models.generate_content(
                     model=model_id,
-                    contents=prompt
+                    contents=prompt,
+                    config={"response_mime_type": "application/json"},
                 )
                 return response
             except Exception as e:
@@ -65,91 +160,31 @@ class ClinicalParser:
 
     def _post_process_json(self, data: Any, key: Optional[str] = None) -> Any:
         """Deeply normalize units like 'centimeter' to 'cm' and clean separators."""
+        # Strings are most of the leaves, so they're normalized inline rather
+        # than through another recursive call; other scalars pass through.
         if isinstance(data, dict):
-            return {k: self._post_process_json(v, k) for k, v in data.items()}
+            return {
+                k: _normalize_text(v, k) if isinstance(v, str) else
+                   self._post_process_json(v, k) if isinstance(v, (dict, list)) else v
+                for k, v in data.items()
+            }
         elif isinstance(data, list):
-            return [self._post_process_json(i, key) for i in data]
+            return [
+                _normalize_text(i, key) if isinstance(i, str) else
+                self._post_process_json(i, key) if isinstance(i, (dict, list)) else i
+                for i in data
+            ]
         elif isinstance(data, str):
-            res = data
-            
-            # 1. Global Unit Normalization (Safe for all fields)
-            global_norm = {
-                "centimeters": "cm",
-                "centimeter": "cm",
-                "square centimeters": "sq cm",
-                "cubic centimeters": "cm³",
-                " %": "%",
-                " .": ".",
-            }
-            
-            for old, new in global_norm.items():
-                if old in res.lower():
-                    import re
-                    res = re.sub(re.escape(old), new, res, flags=re.IGNORECASE)
-
-            # 2. Field-Specific Normalization (ONLY for measurements/structured fields)
-            measurement_fields = ["measurements", "tunnels", "max_depth", "undermining", "area_sq_cm", "volume_cu_cm"]
-            if key in measurement_fields:
-                struct_norm = {
-                    ".point": ".",
-                    " point ": ".",
-                    " by ": " x ",
-                    ";": ".",
-                    # Only replace period with x if it looks like a measurement (digit period space digit)
-                }
-                for old, new in struct_norm.items():
-                    if old in res.lower():
-                        import re
-                        res = re.sub(re.escape(old), new, res, flags=re.IGNORECASE)
-                
-                # Fix dimensions: "4. 3. 1" -> "4 x 3 x 1"
-                import re
-                res = re.sub(r'(\d+)\.\s+(\d+)', r'\1 x \2', res)
-            
-            # 3. Narrative Cleanup (Fix unintended "x" separators and common mis-hears)
-            narrative_fields = ["clinical_summary", "treatment_plan", "comments"]
-            
-            if key in narrative_fields or key is None:
-                # A. Apply Abbreviation Expansion (Safety Net)
-                import re
-                from .abbreviations import ABBREVIATION_STORE
-                for category, items in ABBREVIATION_STORE.items():
-                    for short_code, full_term in items.items():
-                        # STRICT MATCHING: Word boundary only.
-                        # This prevents "TEST3" matching "ST3"
-                        # But allows "D" to match " D " (as a standalone letter/symbol)
-                        pattern = r'\b' + re.escape(short_code) + r'\b'
-                        
-                        # Only replace if the full term isn't already immediately there.
-                        # This crude check helps prevent "Stage 3 Pressure Injury Pressure Injury"
-                        # but follows the user rule: "convert short form to long form"
-                        if re.search(pattern, res, re.IGNORECASE):
-                             if full_term.lower() not in res.lower():
-                                res = re.sub(pattern, full_term, res, flags=re.IGNORECASE)
-
-                res = clean_narrative_text(res)
-            
-            return res.strip()
+            return _normalize_text(data, key)
         return data
 
     async def parse_transcript(self, transcript: str) -> Dict[str, Any]:
         """Initial parsing of a full transcript."""
         self.current_model_idx = 0  # Reset to primary model each call
-        abbrev_list = get_abbreviation_markdown()
-        prompt = INTENT_EXTRACTION_PROMPT.format(
-            transcript=transcript, 
-            abbreviations_list=abbrev_list
-        )
+        prompt = _INTENT_TEMPLATE.format(transcript=transcript)
         response = await self._generate_with_retry(prompt)
         try:
-            # Clean response text if it has markdown blocks
-            text = response.text.strip()
-            if text.startswith("```json"):
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif text.startswith("```"):
-                text = text.split("```")[1].split("```")[0].strip()
-            
-            parsed = json.loads(text)
+            parsed = _extract_json(response.text)
             return self._post_process_json(parsed)
         except Exception as e:
             print(f"Error parsing LLM response: {e}")
@@ -167,18 +202,13 @@ class ClinicalParser:
             "em_justification": existing_state.get("em_justification", {})
         }
         
-        abbrev_list = get_abbreviation_markdown()
-        prompt = ADDENDUM_PATCH_PROMPT.format(
-            existing_json=json.dumps(minimized_state, indent=2),
+        prompt = _ADDENDUM_TEMPLATE.format(
+            existing_json=orjson.dumps(minimized_state, option=orjson.OPT_INDENT_2).decode(),
             addendum_transcript=addendum_transcript,
-            abbreviations_list=abbrev_list
         )
         response = await self._generate_with_retry(prompt)
         try:
-            text = response.text.strip()
-            if text.startswith("```json"):
-                text = text.split("```json")[1].split("```")[0].strip()
-            parsed = json.loads(text)
+            parsed = _extract_json(response.text)
             return self._post_process_json(parsed)
         except Exception as e:
             print(f"Error parsing patch response: {e}")
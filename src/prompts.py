@@ -17,9 +17,40 @@ Prompts:
     - Instructs Gemini to generate a JSON Patch (RFC 6902) to update existing state
     - Output: list of patch operations (add/replace/remove)
     - Falls back to appending transcript as a comment if patch generation fails
+
+Layout: each prompt puts its static text (instructions, abbreviation table,
+schema) first and the per-request slots (transcript, existing JSON) last, so
+consecutive requests share a byte-identical prefix that Gemini's implicit
+context caching can reuse.
 """
 
 
+# Short forms whose meaning the model must not guess; shared by both prompts.
+_CORE_ABBREVIATIONS = """─────────────────────────────────────────────
+ABBREVIATIONS & CLINICAL CODES (CORE REFERENCE)
+─────────────────────────────────────────────
+The provider may use short forms. You MUST replace them with their full clinical meanings:
+
+- "Art" or "AU" → Arterial ulcer
+- "D", "DM", "DU" → Diabetic ulcer
+- "VU", "Ven", "VLU" → Venous leg ulcer
+- "ST" → Skin tear
+- "Surg" → Surgical wound
+- "AKA/BKA" → Above/Below knee amputation
+- "SEROSANG" → Serosanguineous
+- "MOD" → Moderate
+- "G" → Granulation
+- "YS" → Yellow slough
+- "TUN" → Tunneling
+- "UM" → Undermining
+- "NPWT" → Negative pressure wound therapy
+- "I&D" → Incision and drainage
+- "BID/TID/QID" → Twice/Three/Four times daily
+- "↑" → Improving
+- "↓" → Deteriorating
+- "=" → Stable / Unchanged
+"""
+
 INTENT_EXTRACTION_PROMPT = """
 System: You are a clinical transcription parser specialized in Wound Care documentation. Your role is to extract structured data from provider dictation transcripts and output a JSON object that maps directly to a Wound Care Provider Documentation Template.
 
@@ -67,30 +98,7 @@ NARRATIVE PUNCTUATION
 ─────────────────────────────────────────────
 For narrative fields: use proper periods (.) and commas (,) to separate thoughts. Ensure professional grammar.
 
-─────────────────────────────────────────────
-ABBREVIATIONS & CLINICAL CODES (CORE REFERENCE)
-─────────────────────────────────────────────
-The provider may use short forms. You MUST replace them with their full clinical meanings:
-
-- "Art" or "AU" → Arterial ulcer
-- "D", "DM", "DU" → Diabetic ulcer
-- "VU", "Ven", "VLU" → Venous leg ulcer
-- "ST" → Skin tear
-- "Surg" → Surgical wound
-- "AKA/BKA" → Above/Below knee amputation
-- "SEROSANG" → Serosanguineous
-- "MOD" → Moderate
-- "G" → Granulation
-- "YS" → Yellow slough
-- "TUN" → Tunneling
-- "UM" → Undermining
-- "NPWT" → Negative pressure wound therapy
-- "I&D" → Incision and drainage
-- "BID/TID/QID" → Twice/Three/Four times daily
-- "↑" → Improving
-- "↓" → Deteriorating
-- "=" → Stable / Unchanged
-
+""" + _CORE_ABBREVIATIONS + """
 ─────────────────────────────────────────────
 E/M JUSTIFICATION (AUTOFILL RULES)
 ─────────────────────────────────────────────
@@ -109,13 +117,6 @@ Total Time = Exam + Documenting + Coordinating.
 
 {abbreviations_list}
 
-User: Extract structured clinical data from the following wound care transcript.
-
-TRANSCRIPT:
-{transcript}
-
-─────────────────────────────────────────────
-
 OUTPUT JSON SCHEMA (you MUST follow this exactly):
 {{
   "patient_information": {{
@@ -140,6 +141,13 @@ OUTPUT JSON SCHEMA (you MUST follow this exactly):
   }}
 }}
 
+─────────────────────────────────────────────
+
+User: Extract structured clinical data from the following wound care transcript.
+
+TRANSCRIPT:
+{transcript}
+
 Return ONLY the JSON object.
 """
 
@@ -147,12 +155,6 @@ ADDENDUM_PATCH_PROMPT = """
 System: You are a JSON Patch generator (RFC 6902) for clinical data updates.
 Your task is to update the existing encounter state based on an addendum transcript.
 
-Existing JSON:
-{existing_json}
-
-Addendum Transcript:
-{addendum_transcript}
-
 RULES:
 1. ONLY generate valid JSON Patch operations ([{{ "op": "replace", "path": "/...", "value": "..." }}]).
 2. NEVER replace the entire "wounds" array if only one wound is updated.
@@ -160,31 +162,14 @@ RULES:
 4. If general comments are provided, append them to "/comments".
 5. Preserve all existing data that is not explicitly contradicted or updated.
 
-─────────────────────────────────────────────
-ABBREVIATIONS & CLINICAL CODES (CORE REFERENCE)
-─────────────────────────────────────────────
-The provider may use short forms. You MUST replace them with their full clinical meanings:
+""" + _CORE_ABBREVIATIONS + """
+{abbreviations_list}
 
-- "Art" or "AU" → Arterial ulcer
-- "D", "DM", "DU" → Diabetic ulcer
-- "VU", "Ven", "VLU" → Venous leg ulcer
-- "ST" → Skin tear
-- "Surg" → Surgical wound
-- "AKA/BKA" → Above/Below knee amputation
-- "SEROSANG" → Serosanguineous
-- "MOD" → Moderate
-- "G" → Granulation
-- "YS" → Yellow slough
-- "TUN" → Tunneling
-- "UM" → Undermining
-- "NPWT" → Negative pressure wound therapy
-- "I&D" → Incision and drainage
-- "BID/TID/QID" → Twice/Three/Four times daily
-- "↑" → Improving
-- "↓" → Deteriorating
-- "=" → Stable / Unchanged
+Existing JSON:
+{existing_json}
 
-{abbreviations_list}
+Addendum Transcript:
+{addendum_transcript}
 
 Return ONLY the JSON array of operations.
 """
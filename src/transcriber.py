@@ -8,11 +8,24 @@ Supports audio formats: .wav, .mp3, .m4a, .ogg, .mp4
 Requires: OPENAI_API_KEY in .env
 """
 import os
+import asyncio
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Vocabulary hint for Whisper: wound-care terms it otherwise mishears
+# (see the _NORM_MAP corrections in src/utils.py).
+WHISPER_PROMPT = (
+    "Wound care dictation. Common terms: Medihoney, calcium alginate, bordered foam, "
+    "dry gauze, Normal Saline, compression wrap, positioning wedge, debridement, "
+    "periwound, exudate, granulation, undermining, tunneling."
+)
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
 class Transcriber:
     """Handles Voice-to-Text conversion using OpenAI Whisper with Async support."""
     
@@ -37,13 +50,18 @@ class Transcriber:
         """Converts audio file to text transcript (Async)."""
         client = self._get_client()
         
-        if not os.path.exists(audio_file_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+        # Read the audio off the event loop; the SDK accepts (filename, bytes)
+        try:
+            audio_bytes = await asyncio.to_thread(_read_bytes, audio_file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Audio file not found: {audio_file_path}") from None
             
-        with open(audio_file_path, "rb") as audio_file:
-            transcript = await client.audio.transcriptions.create(
-                model="whisper-1", 
-                file=audio_file,
-                response_format="text"
-            )
+        transcript = await client.audio.transcriptions.create(
+            model="whisper-1", 
+            file=(os.path.basename(audio_file_path), audio_bytes),
+            # Dictations are English; skips Whisper's language detection pass
+            language="en",
+            prompt=WHISPER_PROMPT,
+            response_format="text"
+        )
         return transcript
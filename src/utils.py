@@ -1,5 +1,6 @@
 import re
 import os
+from functools import lru_cache
 
 # ─────────────────────────────────────────────────────────────
 # Scriberyte Filename Convention
@@ -106,6 +107,54 @@ def get_output_basename(original_audio_filename: str) -> str:
     return os.path.splitext(original_audio_filename)[0]
 
 
+# ─────────────────────────────────────────────────────────────
+# Narrative cleanup patterns (compiled once at import)
+# ─────────────────────────────────────────────────────────────
+
+# Clinical term normalization, done in one pass: a single alternation
+# (longest key first) plus a lookup on the lowercased match. Replacements
+# are final — the old rule chain "Education 3 x Forced" -> "Education
+# reinforced" -> "Education was reinforced" is folded into the table, and
+# "calcium alkenate" is covered by "alkenate" (keeping the caller's case
+# on "calcium").
+_NORM_MAP = {
+    "alkenate": "alginate",
+    "protecting wood": "protecting boot",
+    "protecting wedge": "positioning wedge",
+    "comparison wrap": "compression wrap",
+    "compilation therapy": "compression therapy",
+    "dry quartz": "dry gauze",
+    "boarded foam": "bordered foam",
+    "boarder foam": "bordered foam",
+    "mild honey": "Medihoney",
+    "normal saline": "Normal Saline",
+    "rejuvenation": "elevation",
+    "education 3 x forced": "Education was reinforced",
+    "education 3 x reinforced": "Education was reinforced",
+    "education reinforced": "Education was reinforced",
+}
+_NORM_RE = re.compile("|".join(re.escape(old) for old in sorted(_NORM_MAP, key=len, reverse=True)), re.IGNORECASE)
+
+
+def _normalize_term(match):
+    return _NORM_MAP[match.group(0).lower()]
+
+
+# pattern: optional period + space + x + space followed by a sentence starter
+_SENTENCE_STARTERS = "Apply|Cleaned|Continue|Change|Heal|To|No|Education|Patient|Observed|Wound|Dressings|Initiate|Encourage"
+_SENTENCE_X_RE = re.compile(r'[\.\s]*\s+x\s+([A-Z]|' + _SENTENCE_STARTERS + r')')
+# "word x word" (not a measurement like "4 x 5")
+_WORD_X_WORD_RE = re.compile(r'([a-zA-Z]{2,})\s+x\s+([a-zA-Z]{2,})')
+_TRAILING_X_RE = re.compile(r'\s+x\s*$')
+_DOUBLE_DOT_RE = re.compile(r'\.(?: ?\.)+')
+
+
+def _join_sentences(match):
+    return f"{match.group(1)}. {match.group(2).capitalize()}"
+
+
+# Dressing/education phrasing repeats across wounds and visits
+@lru_cache(maxsize=2048)
 def clean_narrative_text(text: str) -> str:
     """
     Cleans up clinical narrative text:
@@ -119,52 +168,28 @@ def clean_narrative_text(text: str) -> str:
     res = text.strip()
     
     # 1. Clinical Term Normalization (Run BEFORE punctuation fix to catch things like "3 x Forced")
-    norm_map = {
-        "alkenate": "alginate",
-        "calcium alkenate": "calcium alginate",
-        "protecting wood": "protecting boot",
-        "protecting wedge": "positioning wedge",
-        "comparison wrap": "compression wrap",
-        "compilation therapy": "compression therapy",
-        "dry quartz": "dry gauze", 
-        "boarded foam": "bordered foam",
-        "boarder foam": "bordered foam",
-        "mild honey": "Medihoney",
-        "normal saline": "Normal Saline",
-        "rejuvenation": "elevation",
-        "Education 3 x Forced": "Education reinforced",
-        "Education 3 x reinforced": "Education reinforced",
-        "Education reinforced": "Education was reinforced"
-    }
-    
-    for old, new in norm_map.items():
-        res = re.sub(re.escape(old), new, res, flags=re.IGNORECASE)
+    res = _NORM_RE.sub(_normalize_term, res)
 
     # 2. Fix unintentional " x " separator glitch
-    
-    # pattern: optional period + space + x + space followed by a sentence starter
-    sentence_starters = "Apply|Cleaned|Continue|Change|Heal|To|No|Education|Patient|Observed|Wound|Dressings|Initiate|Encourage"
-    # Added [a-z] to catching start of sentence if it was lowercase
-    res = re.sub(r'[\.\s]*\s+x\s+([A-Z]|' + sentence_starters + r')', r'. \1', res)
-    
-    # Handle lowercase joining: "word x word" -> "word. Word"
-    # Ensure it's not a measurement like "4 x 5"
-    # We use a lambda to capitalize the second word
-    def repl_func(match):
-        return f"{match.group(1)}. {match.group(2).capitalize()}"
-    
-    res = re.sub(r'([a-zA-Z]{2,})\s+x\s+([a-zA-Z]{2,})', repl_func, res)
+    # All three patterns need a lowercase "x", so most narratives skip them
+    if "x" in res:
+        # Added [a-z] to catching start of sentence if it was lowercase
+        res = _SENTENCE_X_RE.sub(r'. \1', res)
+
+        # Handle lowercase joining: "word x word" -> "word. Word"
+        # Ensure it's not a measurement like "4 x 5"
+        # We capitalize the second word
+        res = _WORD_X_WORD_RE.sub(_join_sentences, res)
 
-    # Handle trailing x
-    res = re.sub(r'\s+x\s*$', r'.', res)
+        # Handle trailing x
+        res = _TRAILING_X_RE.sub('.', res)
 
     # 3. Final Punctuation Check
-    # Ensure double periods don't happen
-    res = res.replace("..", ".")
-    res = res.replace(". .", ".")
-    
+    # Ensure double periods don't happen (the pattern can only match where one of these occurs)
+    if ".." in res or ". ." in res:
+        res = _DOUBLE_DOT_RE.sub('.', res)
+
     # Ensure start of sentence is capitalized (optional but nice)
-    if res and res[0].islower():
-        res = res[0].upper() + res[1:]
+    res = res[:1].upper() + res[1:]
 
     return res.strip()
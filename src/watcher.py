@@ -18,11 +18,16 @@ Duplicate Protection:
   - In-memory cache (5-minute expiry) prevents re-processing the same file
     if the watcher polls before S3 deletion propagates.
 
+Shutdown:
+  - SIGTERM (e.g. an ECS deploy) stops polling after the current scan, and
+    pending chart uploads are drained before the process exits.
+
 Run with:
   python -m src.run_watcher
 """
 import asyncio
 import os
+import signal
 from datetime import datetime
 from .manager import EncounterManager
 
@@ -41,6 +46,7 @@ class S3Watcher:
         self.input_prefix = os.getenv("S3_INPUT_PREFIX", self.manager.s3_prefix)
         self.loop_interval = loop_interval
         self.is_running = False
+        self._stop_event = asyncio.Event()
         self.processed_cache = {} # Key -> Timestamp of processing
         from datetime import timedelta
         self.watcher_start_time = datetime.utcnow() - timedelta(minutes=15)
@@ -49,9 +55,27 @@ class S3Watcher:
     async def start(self):
         print(f"--> S3 Watcher Started (PID: {os.getpid()}). Monitoring s3://{self.manager.s3_bucket}/{self.input_prefix} every {self.loop_interval}s")
         self.is_running = True
-        while self.is_running:
-            await self.scan_and_process()
-            await asyncio.sleep(self.loop_interval)
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.stop)
+        except NotImplementedError:
+            pass  # No loop signal handlers on Windows
+        try:
+            while self.is_running:
+                await self.scan_and_process()
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self.loop_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Let background chart uploads finish before the process exits
+            print("--> S3 Watcher stopping, waiting for pending uploads...")
+            await self.manager.wait_for_uploads()
+            self.manager.close()
+
+    def stop(self):
+        """Stop polling after the current scan (installed as the SIGTERM handler)."""
+        self.is_running = False
+        self._stop_event.set()
 
     async def scan_and_process(self):
         if not self.manager.s3_client:
@@ -1,8 +1,23 @@
+import pytest
 from fastapi.testclient import TestClient
+
+import app as app_module
 from app import app
+from src.manager import EncounterManager
 
 client = TestClient(app)
 
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """Point the API at a throwaway local manager so tests never touch data/ or S3."""
+    monkeypatch.delenv("S3_BUCKET_NAME", raising=False)
+    m = EncounterManager(storage_dir=str(tmp_path))
+    m.scriberyte.is_configured = lambda: False
+    monkeypatch.setattr(app_module, "manager", m)
+    yield m
+    m.close()
+
 def test_health_check():
     """Health endpoint must return 200 and status healthy."""
     response = client.get("/health")
@@ -14,3 +29,23 @@ def test_api_status():
     response = client.get("/appointments")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+def test_appointments_conditional_get(manager):
+    """A matching If-None-Match gets 304 until the listing changes."""
+    etag = client.get("/appointments").headers["etag"]
+    response = client.get("/appointments", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    client.post("/appointments/book", json={"patient_name": "ETag Test"})
+    response = client.get("/appointments", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+def test_appointments_limit(manager):
+    """`limit` caps the listing to the newest N appointments and must be positive."""
+    ids = [client.post("/appointments/book", json={"patient_name": f"Limit Test {i}"}).json()["appointment_id"] for i in range(2)]
+    response = client.get("/appointments", params={"limit": 1})
+    assert response.status_code == 200
+    assert [a["appointment_id"] for a in response.json()] == [ids[-1]]
+    assert client.get("/appointments", params={"limit": 0}).status_code == 422
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+import jsonpatch
+import pytest
+
+from src.manager import EncounterManager
+from src.models import EncounterState
+
+PARSED = {
+    "patient_information": {"patient_name": "Jane Doe"},
+    "wounds": [{"number": "1", "location": "Sacrum", "measurements": "2 x 3 x 0.5"}],
+    "comments": "Initial visit",
+    "treatment_plan": "Dressing change daily",
+}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.delenv("S3_BUCKET_NAME", raising=False)
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    m = EncounterManager(storage_dir=str(tmp_path))
+    m.scriberyte.is_configured = lambda: False
+
+    async def parse_transcript(transcript):
+        return PARSED
+
+    m.parser.parse_transcript = parse_transcript
+    yield m
+    m.close()
+
+
+def test_history_round_trips_through_state_file(manager):
+    """Each save writes the full history with the state, and load_state reads it back."""
+    asyncio.run(manager.create_from_transcript("first", "appt-1"))
+    asyncio.run(manager.create_from_transcript("second", "appt-1"))
+
+    state = manager.load_state("appt-1")
+    assert state.version == 2
+    assert [h["version"] for h in state.history] == [1, 2]
+    assert [h["transcript"] for h in state.history] == ["first", "second"]
+
+
+def test_updated_at_is_stamped_at_save_time(manager):
+    """The request timestamp goes into history; updated_at reflects when the chart was saved."""
+    requested = datetime.now() - timedelta(minutes=5)
+    state = asyncio.run(manager.create_from_transcript("dictation", "appt-1", now=requested))
+    assert state.history[-1]["timestamp"] == requested.isoformat()
+    assert state.updated_at > requested
+
+
+def test_get_version_snapshot_rebuilds_every_version(manager):
+    """Reverse patches in history rebuild the chart exactly as it was at each version."""
+    patches = iter([
+        [{"op": "replace", "path": "/wounds/0/measurements", "value": "4 x 3 x 1"}],
+        [{"op": "add", "path": "/wounds/-", "value": {"number": "2", "location": "Heel"}}],
+        [{"op": "replace", "path": "/treatment_plan", "value": "Offload heel"}],
+    ])
+
+    async def generate_patch(state, transcript):
+        return next(patches)
+
+    manager.parser.generate_patch = generate_patch
+
+    charts = {}
+    state = asyncio.run(manager.create_from_transcript("dictation", "appt-1"))
+    charts[state.version] = state.chart_view()
+    for i in range(3):
+        state = asyncio.run(manager.apply_addendum("appt-1", f"addendum {i}"))
+        charts[state.version] = state.chart_view()
+
+    state = manager.load_state("appt-1")
+    assert len(charts) == 4
+    for version, chart in charts.items():
+        assert manager.get_version_snapshot(state, version) == chart
+
+    # The chart renders each version's snapshot, not the stored patch ops
+    with open(os.path.join(manager.storage_dir, "appt-1.html"), encoding="utf-8") as f:
+        html = f.read()
+    assert "reverse_patch" not in html
+    assert "Offload heel" in html
+
+
+def test_sync_picks_up_charts_that_sort_before_synced_keys(manager):
+    """Every sync lists the whole chart folder, so late uploads with older names aren't skipped."""
+    store = {
+        "woundcare/p1/audio/visit.mp3": b"",
+        "woundcare/p1/clinical_data_jsons/2026-b.json": EncounterState(appointment_id="b").model_dump_json().encode(),
+    }
+
+    class FakeS3:
+        def get_paginator(self, name):
+            return self
+
+        def paginate(self, Bucket, Prefix, Delimiter=None):
+            keys = sorted(k for k in store if k.startswith(Prefix))
+            if Delimiter:
+                yield {"CommonPrefixes": [{"Prefix": p} for p in sorted({Prefix + k[len(Prefix):].split("/")[0] + "/" for k in keys})]}
+            else:
+                yield {"Contents": [{"Key": k} for k in keys]}
+
+        def download_file(self, Bucket, Key, Filename):
+            with open(Filename, "wb") as f:
+                f.write(store[Key])
+
+    manager.s3_client, manager.s3_bucket = FakeS3(), "bucket"
+    manager.sync_appointments_from_s3()
+    store["woundcare/p1/clinical_data_jsons/2025-a.json"] = EncounterState(appointment_id="a").model_dump_json().encode()
+    manager.sync_appointments_from_s3()
+
+    assert sorted(a.appointment_id for a in manager.list_appointments(sync_s3=False)) == ["a", "b"]
+
+
+def test_field_patches_match_full_jsonpatch_path():
+    """The field-level fast path yields the same state as jsonpatch + full validation."""
+    state = EncounterState(
+        appointment_id="appt-1",
+        wounds=[{"number": "1", "location": "Sacrum", "measurements": "2 x 3 x 0.5"}],
+        history=[{"version": 1, "type": "initial_dictation"}],
+    )
+    patch_ops = [
+        {"op": "replace", "path": "/wounds/0/measurements", "value": "4 x 3 x 2"},
+        {"op": "replace", "path": "/wounds/0/location", "value": "Left heel"},
+        {"op": "replace", "path": "/patient_information/facility", "value": "Oak SNF"},
+        {"op": "replace", "path": "/em_justification/total_time", "value": "45"},
+        {"op": "replace", "path": "/treatment_plan", "value": "Offload heel"},
+    ]
+
+    fast = EncounterManager._apply_field_patches(state, patch_ops)
+    patched = jsonpatch.apply_patch(state.model_dump(mode="json", exclude={"history"}), patch_ops)
+    patched["history"] = state.history
+    full = EncounterState.model_validate(patched)
+
+    assert fast is not None
+    assert fast.model_dump() == full.model_dump()
+    assert (fast.wounds[0].area_sq_cm, fast.wounds[0].volume_cu_cm) == ("12.0", "24.0")
+
+
+def test_field_patches_leave_bookkeeping_fields_to_jsonpatch():
+    """Ops on history, version or ids are not applied by the fast path."""
+    state = EncounterState(appointment_id="appt-1")
+    for path, value in (("/history", []), ("/version", 99), ("/appointment_id", "other")):
+        assert EncounterManager._apply_field_patches(state, [{"op": "replace", "path": path, "value": value}]) is None
+
+
+def test_concurrent_saves_leave_file_and_index_in_step(manager):
+    """Overlapping saves of one appointment never leave a torn file or a stale index row."""
+    async def save_all():
+        states = [EncounterState(appointment_id="appt-1", treatment_plan=f"plan {i}") for i in range(20)]
+        await asyncio.gather(*(manager.save_state_async(s) for s in states))
+
+    asyncio.run(save_all())
+
+    state = manager.load_state("appt-1")
+    listed = manager.list_appointments(sync_s3=False)
+    assert [a.treatment_plan for a in listed] == [state.treatment_plan]
+    assert not [name for name in os.listdir(manager.storage_dir) if name.endswith(".tmp")]
+
+
+def test_listing_index_follows_save_delete_and_load(manager):
+    """The listing index tracks saves and deletes, and picks up state files it has no row for."""
+    manager.save_state(EncounterState(appointment_id="a"))
+    manager.save_state(EncounterState(appointment_id="b"))
+    assert sorted(a.appointment_id for a in manager.list_appointments(sync_s3=False)) == ["a", "b"]
+
+    etag = manager.appointments_etag()
+    manager.save_state(EncounterState(appointment_id="b", treatment_plan="Updated"))
+    assert manager.appointments_etag() != etag
+    assert {a.appointment_id: a.treatment_plan for a in manager.list_appointments(sync_s3=False)}["b"] == "Updated"
+
+    manager.delete_appointment("a")
+    assert [a.appointment_id for a in manager.list_appointments(sync_s3=False)] == ["b"]
+
+    # A state file without an index row (e.g. copied in by hand) is indexed on first load
+    with manager._index:
+        manager._index.execute("DELETE FROM appts WHERE id = ?", ("b",))
+    assert manager.list_appointments(sync_s3=False) == []
+    manager.load_state("b")
+    assert [a.appointment_id for a in manager.list_appointments(sync_s3=False)] == ["b"]
+
+
+def test_background_uploads_land_in_save_order(manager):
+    """Uploads for one appointment run in save order, and wait_for_uploads blocks until they finish."""
+    puts = []
+
+    class SlowS3:
+        def put_object(self, Bucket, Key, Body, ContentType):
+            if b"first" in Body:
+                time.sleep(0.2)
+            puts.append((Key, Body))
+
+    manager.s3_client, manager.s3_bucket = SlowS3(), "bucket"
+    manager._background_uploads = True
+
+    async def save_both():
+        await manager.save_state_async(EncounterState(appointment_id="appt-1", treatment_plan="first"))
+        await manager.save_state_async(EncounterState(appointment_id="appt-1", treatment_plan="second"))
+        assert "appt-1" in manager._pending_uploads
+        await manager.wait_for_uploads("appt-1")
+        assert len(puts) == 4
+        await manager.wait_for_uploads()
+        assert not manager._pending_uploads
+
+    asyncio.run(save_both())
+
+    for suffix in (".html", ".json"):
+        bodies = [body for key, body in puts if key.endswith(suffix)]
+        assert [b"first" in body for body in bodies] == [True, False]
+        assert b"second" in bodies[-1]
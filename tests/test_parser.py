@@ -0,0 +1,12 @@
+from src.parser import _extract_json
+
+def test_extract_json_strips_fences():
+    """JSON is read from plain, ```json and bare ``` fenced responses."""
+    assert _extract_json('{"a": 1}') == {"a": 1}
+    assert _extract_json('```json\n{"a": 1}\n```') == {"a": 1}
+    assert _extract_json('```\n{"a": 1}\n```') == {"a": 1}
+
+def test_extract_json_unclosed_fence():
+    """A response cut off before the closing fence still parses."""
+    assert _extract_json('```json\n{"a": [1, 2]}') == {"a": [1, 2]}
+    assert _extract_json('```\n{"a": 1}\n') == {"a": 1}
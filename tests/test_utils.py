@@ -30,3 +30,9 @@ def test_clinical_normalizations():
 def test_trailing_x():
     """Test removal of trailing x."""
     assert clean_narrative_text("End of note x") == "End of note."
+
+def test_repeated_periods_collapse():
+    """Runs of periods, spaced or not, collapse to one."""
+    assert clean_narrative_text("Wound clean... Dressing applied") == "Wound clean. Dressing applied"
+    assert clean_narrative_text("Wound clean. . . Dressing applied") == "Wound clean. Dressing applied"
+    assert clean_narrative_text("Wound clean...") == "Wound clean."